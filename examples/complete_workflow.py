@@ -1,17 +1,20 @@
 """
 Example: Complete precision agriculture workflow
 Generates synthetic harvest data and runs full analysis pipeline
+
+Requires the package to be installed (pip install -e .), or run from the
+repository root with: python -m examples.complete_workflow
 """
 
 import numpy as np
 import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Point, Polygon
-from pathlib import Path
+import logging
+import os
 import sys
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 from src.ingest import ingest_harvest_data
 from src.zones import delineate_management_zones
@@ -30,63 +33,63 @@ def generate_synthetic_harvest_data(n_points: int = 1000,
     Returns:
         DataFrame with latitude, longitude, yield
     """
-    np.random.seed(seed)
+    rng = np.random.default_rng(seed)
     
     # Define field bounds (example: sugarcane field in Brazil)
     center_lat, center_lon = -20.5, -49.5
     field_size = 0.01  # ~1 km
     
-    # Generate points in a rectangular field
-    lats = np.random.uniform(
-        center_lat - field_size/2, 
-        center_lat + field_size/2, 
-        n_points
-    )
-    lons = np.random.uniform(
-        center_lon - field_size/2, 
-        center_lon + field_size/2, 
-        n_points
-    )
-    
-    # Create spatial yield pattern (simulate soil fertility gradient + noise)
-    # Zone 1: Low productivity (northwest)
-    zone1_factor = 1.0 - 0.5 * (
-        (lats - center_lat + field_size/2) / field_size +
-        (lons - center_lon + field_size/2) / field_size
-    )
-    
-    # Zone 2: High productivity (southeast)
-    zone2_factor = 0.5 * (
-        (lats - center_lat + field_size/2) / field_size +
-        (lons - center_lon + field_size/2) / field_size
+    # Generate points in a rectangular field (one row per coordinate)
+    lats, lons = rng.uniform(
+        [[center_lat - field_size/2], [center_lon - field_size/2]],
+        [[center_lat + field_size/2], [center_lon + field_size/2]],
+        size=(2, n_points)
     )
     
     # Base yield with spatial pattern
     base_yield = 70  # ton/ha
     yield_variation = 25  # ton/ha
     
-    yields = base_yield + yield_variation * (zone1_factor + zone2_factor)
+    # All yield steps below reuse two working buffers instead of allocating
+    # a new array per intermediate result
+    yields = np.empty(n_points)
+    scratch = np.empty(n_points)
+    
+    # Create spatial yield pattern (simulate soil fertility gradient + noise)
+    # The documented intent: low productivity in the northwest, high in the
+    # southeast. The gradient runs along (lon - lat), from -1 at the NW corner
+    # to +1 at the SE corner, around the mean the old formulas produced
+    # (base_yield + yield_variation), so it spans yield_variation in total
+    np.subtract(lons, center_lon, out=yields)
+    np.subtract(lats, center_lat, out=scratch)
+    yields -= scratch
+    yields *= 0.5 * yield_variation / field_size
+    yields += base_yield + yield_variation
     
     # Add random noise
-    yields += np.random.normal(0, 5, n_points)
+    rng.standard_normal(out=scratch)
+    scratch *= 5
+    yields += scratch
     
     # Add some localized hot spots (e.g., better water availability)
+    # Bonus = 15 * exp(-1000 * distance)
     hotspot_lat, hotspot_lon = center_lat + 0.002, center_lon - 0.002
-    distance_to_hotspot = np.sqrt(
-        (lats - hotspot_lat)**2 + (lons - hotspot_lon)**2
-    )
-    hotspot_bonus = 15 * np.exp(-distance_to_hotspot * 1000)
-    yields += hotspot_bonus
+    np.subtract(lats, hotspot_lat, out=scratch)
+    np.hypot(scratch, lons - hotspot_lon, out=scratch)
+    scratch *= -1000
+    np.exp(scratch, out=scratch)
+    scratch *= 15
+    yields += scratch
     
     # Clip to realistic range
-    yields = np.clip(yields, 40, 120)
+    np.clip(yields, 40, 120, out=yields)
     
-    # Create DataFrame
+    # Create DataFrame (yield needs no more than float32 precision)
     df = pd.DataFrame({
         'latitude': lats,
         'longitude': lons,
-        'yield': yields
-    })
+        'yield': yields.astype(np.float32)
+    }, copy=False)
     
     return df
 
@@ -98,31 +101,38 @@ def run_complete_example():
     print("PRECISION AGRICULTURE PLATFORM - COMPLETE EXAMPLE")
     print("=" * 70)
     
-    # Create output directory
-    output_dir = Path(__file__).parent.parent / "output"
-    output_dir.mkdir(exist_ok=True)
+    # Create output directory (paths below are plain strings, which every
+    # writer accepts without a Path round-trip)
+    output_dir = os.fspath(Path(__file__).parent.parent / "output")
+    os.makedirs(output_dir, exist_ok=True)
     
     # Step 1: Generate synthetic data
     print("\n📊 STEP 1: Generate Synthetic Harvest Data")
     print("-" * 70)
     df = generate_synthetic_harvest_data(n_points=1500, seed=42)
     
-    # Save to CSV
-    csv_file = output_dir / "harvest_data_synthetic.csv"
-    df.to_csv(csv_file, index=False)
+    # Save to Parquet (binary columnar, no float-to-text conversion) in the
+    # background; the analysis below uses the in-memory DataFrame
+    data_file = os.path.join(output_dir, "harvest_data_synthetic.parquet")
+    executor = ThreadPoolExecutor(max_workers=1)
+    save_future = executor.submit(
+        df.to_parquet, data_file, engine='pyarrow', compression='zstd', index=False
+    )
+    executor.shutdown(wait=False)
     print(f"✅ Generated {len(df)} GPS points")
-    print(f"✅ Saved to: {csv_file}")
     
     # Step 2: Ingest and validate data
     print("\n📥 STEP 2: Ingest and Validate Data")
     print("-" * 70)
     harvest_gdf, boundary_gdf, validation = ingest_harvest_data(
-        data_file=csv_file,
-        file_type='csv',
+        dataframe=df,
         validate=True,
         clean_outliers=True
     )
     
+    save_future.result()
+    print(f"✅ Harvest data saved to: {data_file}")
+    
     if not validation['valid']:
         print("❌ Validation failed. Stopping.")
         return
@@ -140,20 +150,24 @@ def run_complete_example():
     zones_gdf = zones_results['zones_gdf']
     
     # Save zones to shapefile
-    zones_file = output_dir / "management_zones.shp"
-    zones_gdf.to_file(zones_file)
+    zones_file = os.path.join(output_dir, "management_zones.shp")
+    zones_gdf.to_file(zones_file, engine="pyogrio")
     print(f"\n✅ Zones saved to: {zones_file}")
     
     # Step 4: Generate report
     print("\n📄 STEP 4: Generate Interactive Report")
     print("-" * 70)
-    report_file = output_dir / "precision_agriculture_report.html"
+    report_file = os.path.join(output_dir, "precision_agriculture_report.html")
     
-    html = generate_report(
+    # Validation statistics still describe the data if cleaning removed nothing
+    stats_unchanged = validation['stats']['n_points'] == len(harvest_gdf)
+    
+    generate_report(
         harvest_gdf=harvest_gdf,
         zones_gdf=zones_gdf,
         field_name="Synthetic Field Demo",
-        output_file=str(report_file)
+        output_file=report_file,
+        stats=validation['stats'] if stats_unchanged else None
     )
     
     print(f"\n✅ Report generated: {report_file}")
@@ -163,7 +177,7 @@ def run_complete_example():
     print("ANALYSIS COMPLETE ✅")
     print("=" * 70)
     print(f"\n📁 Output files:")
-    print(f"   - Harvest data: {csv_file}")
+    print(f"   - Harvest data: {data_file}")
     print(f"   - Management zones: {zones_file}")
     print(f"   - Report: {report_file}")
     
@@ -174,11 +188,19 @@ def run_complete_example():
     print(f"   - Yield range: {harvest_gdf['yield'].min():.1f} - {harvest_gdf['yield'].max():.1f} ton/ha")
     
     print(f"\n🌐 Open the report in your browser:")
-    print(f"   file:///{report_file.absolute()}")
+    print(f"   file:///{os.path.abspath(report_file)}")
     print()
 
 
 if __name__ == "__main__":
+    # Show the pipeline's progress messages alongside the example's own output
+    # (only the src loggers: the root logger stays quiet for library chatter)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    src_logger = logging.getLogger('src')
+    src_logger.addHandler(handler)
+    src_logger.setLevel(logging.INFO)
+    
     try:
         run_complete_example()
     except Exception as e:
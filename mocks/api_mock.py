@@ -5,11 +5,12 @@ Simula endpoint: GET /api/v1/recommendations?field_id={id}
 
 USO:
     python api_mock.py
-    # Servidor roda em http://localhost:5000
+    # Servidor (waitress, 8 threads) roda em http://localhost:5000
+    # Alternativa multiprocesso: gunicorn -w 4 -b 0.0.0.0:5000 api_mock:app
     # Testar: curl http://localhost:5000/api/v1/recommendations?field_id=F001
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 import json
 from pathlib import Path
 
@@ -18,6 +19,12 @@ app = Flask(__name__)
 # Carregar dados de exemplo
 MOCK_DATA_PATH = Path(__file__).parent / "example_zones.json"
 
+# Dados são estáticos: carrega e serializa uma única vez no import
+with open(MOCK_DATA_PATH, 'r', encoding='utf-8') as f:
+    MOCK_DATA = json.load(f)
+
+MOCK_RESPONSE_BYTES = json.dumps(MOCK_DATA, ensure_ascii=False).encode('utf-8')
+
 @app.route('/api/v1/recommendations', methods=['GET'])
 def get_recommendations():
     """
@@ -36,18 +43,14 @@ def get_recommendations():
             "example": "/api/v1/recommendations?field_id=F001"
         }), 400
     
-    # Carregar mock data
-    with open(MOCK_DATA_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
     # Simular resposta (na versão real, busca do banco)
-    if field_id != data['field_id']:
+    if field_id != MOCK_DATA['field_id']:
         return jsonify({
             "error": f"Talhão {field_id} não encontrado",
-            "available": [data['field_id']]
+            "available": [MOCK_DATA['field_id']]
         }), 404
     
-    return jsonify(data), 200
+    return Response(MOCK_RESPONSE_BYTES, status=200, mimetype='application/json')
 
 
 @app.route('/api/v1/health', methods=['GET'])
@@ -81,6 +84,8 @@ def index():
 
 
 if __name__ == '__main__':
+    from waitress import serve
+    
     print("\n🌱 Precision-Agriculture-Platform Mock API")
     print("=" * 50)
     print(f"📂 Dados mock: {MOCK_DATA_PATH}")
@@ -90,4 +95,4 @@ if __name__ == '__main__':
     print("=" * 50)
     print("\n▶️  Servidor rodando...\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    serve(app, host='0.0.0.0', port=5000, threads=8)
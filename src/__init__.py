@@ -6,6 +6,7 @@ Modules:
 - ingest: Data ingestion and validation
 - zones: Management zone delineation
 - report: Interactive HTML report generation
+- jit: Optional Numba kernel helpers
 """
 
 __version__ = "0.1.0"
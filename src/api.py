@@ -4,14 +4,35 @@ Precision Agriculture Platform - REST API
 Exposes field analysis and zone recommendations via HTTP endpoints.
 """
 
-from datetime import datetime
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from typing import List, Literal, Optional
 
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+    
+    Equivalent to fastapi.responses.ORJSONResponse, which is deprecated in
+    recent FastAPI releases.
+    """
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+
+# Allowed values for zone status and recommendation priority
+ZoneStatus = Literal["optimal", "warning", "critical"]
+ZonePriority = Literal["low", "medium", "high", "critical"]
+
+
 # Pydantic models for API contracts
 class FinancialImpact(BaseModel):
     """Financial impact of zone status."""
@@ -36,7 +57,7 @@ class FinancialImpact(BaseModel):
 class ZoneRecommendation(BaseModel):
     """Agronomic recommendation for a management zone."""
     action: str = Field(..., description="Recommended action")
-    priority: Literal["low", "medium", "high", "critical"] = Field(
+    priority: ZonePriority = Field(
         ...,
         description="Action priority level"
     )
@@ -59,7 +80,7 @@ class ManagementZone(BaseModel):
         le=10,
         description="Profitability score (0-10)"
     )
-    status: Literal["optimal", "warning", "critical"] = Field(
+    status: ZoneStatus = Field(
         ...,
         description="Zone status"
     )
@@ -111,8 +132,12 @@ app = FastAPI(
         "name": "AvilaOps",
         "url": "https://github.com/avilaops/Precision-Agriculture-Platform",
     },
+    default_response_class=ORJSONResponse,
 )
 
+# Zone payloads repeat the same keys many times and compress well
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 
 # Mock data storage (in production, this would be a database)
 MOCK_FIELDS = {
@@ -231,6 +256,50 @@ MOCK_FIELDS = {
 }
 
 
+# Recommendation payloads are static apart from the analysis date, so they
+# are validated and serialized once at import. Each payload is stored as the
+# bytes before and after the date, which is spliced in per request.
+_ANALYSIS_DATE_PLACEHOLDER = "__ANALYSIS_DATE__"
+
+
+def _build_response_template(field_data: dict) -> tuple:
+    """Validate a field payload and split its JSON around the analysis date."""
+    field_rec = FieldRecommendations(
+        **{**field_data, "analysis_date": _ANALYSIS_DATE_PLACEHOLDER}
+    )
+    payload = orjson.dumps(field_rec.model_dump(mode="json"))
+    prefix, _, suffix = payload.partition(_ANALYSIS_DATE_PLACEHOLDER.encode())
+    return prefix, suffix
+
+
+_CACHED_RESPONSES = {
+    short_id: _build_response_template(field_data)
+    for short_id, field_data in MOCK_FIELDS.items()
+}
+
+_AVAILABLE_FIELDS_STR = ", ".join(MOCK_FIELDS)
+
+
+@lru_cache(maxsize=1)
+def _today_bytes(day_ordinal: int) -> bytes:
+    """Analysis date bytes, keyed by day ordinal so the cache rolls over at midnight."""
+    return date.fromordinal(day_ordinal).isoformat().encode()
+
+
+_FIELDS_LIST_BYTES = orjson.dumps({
+    "fields": [
+        {
+            "field_id": data["field_id"],
+            "crop": data["crop"],
+            "area_ha": data["total_area_ha"],
+            "season": data["season"],
+        }
+        for data in MOCK_FIELDS.values()
+    ],
+    "total": len(MOCK_FIELDS),
+})
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -252,7 +321,7 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         "available_fields": len(MOCK_FIELDS),
     }
 
@@ -260,16 +329,7 @@ async def health_check():
 @app.get("/api/v1/fields")
 async def list_fields():
     """List available fields."""
-    fields = [
-        {
-            "field_id": data["field_id"],
-            "crop": data["crop"],
-            "area_ha": data["total_area_ha"],
-            "season": data["season"],
-        }
-        for data in MOCK_FIELDS.values()
-    ]
-    return {"fields": fields, "total": len(fields)}
+    return Response(content=_FIELDS_LIST_BYTES, media_type="application/json")
 
 
 @app.get(
@@ -285,7 +345,7 @@ async def get_recommendations(
         min_length=1,
         max_length=50,
     )
-) -> FieldRecommendations:
+) -> Response:
     """
     Get agronomic recommendations for a field.
     
@@ -299,42 +359,56 @@ async def get_recommendations(
         field_id: Field identifier (e.g., F001, F002)
         
     Returns:
-        FieldRecommendations with complete analysis
+        FieldRecommendations JSON with complete analysis
         
     Raises:
         404: Field not found
     """
     # Extract short field ID (F001 from F001-UsinaGuarani-Piracicaba)
-    short_id = field_id.split("-")[0] if "-" in field_id else field_id
+    short_id = field_id.partition("-")[0]
     
-    if short_id not in MOCK_FIELDS:
+    if short_id not in _CACHED_RESPONSES:
         raise HTTPException(
             status_code=404,
-            detail=f"Field '{field_id}' not found. Available: {', '.join(MOCK_FIELDS.keys())}",
+            detail=f"Field '{field_id}' not found. Available: {_AVAILABLE_FIELDS_STR}",
         )
     
-    field_data = MOCK_FIELDS[short_id]
-    
-    # Update analysis date to current date
-    field_data["analysis_date"] = datetime.now().strftime("%Y-%m-%d")
+    # Splice the current date into the pre-serialized payload
+    prefix, suffix = _CACHED_RESPONSES[short_id]
+    today = _today_bytes(date.today().toordinal())
     
-    return FieldRecommendations(**field_data)
+    return Response(content=prefix + today + suffix, media_type="application/json")
 
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom exception handler for better error messages."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
             "status_code": exc.status_code,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
         },
     )
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+    from pathlib import Path
+    
     import uvicorn
     
-    uvicorn.run(app, host="0.0.0.0", port=5000)
+    # Workers need an import string; uvloop (libuv) and httptools (llhttp)
+    # replace the pure-Python asyncio loop and h11 parser. uvloop does not
+    # support Windows.
+    uvicorn.run(
+        "api:app",
+        app_dir=str(Path(__file__).parent),
+        host="0.0.0.0",
+        port=5000,
+        workers=min(4, os.cpu_count() or 1),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
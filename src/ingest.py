@@ -4,19 +4,111 @@ Handles reading, validation, and preprocessing of harvest data
 
 Input formats supported:
 - CSV with columns: latitude, longitude, yield (productivity)
+- Parquet with the same columns as CSV
 - Shapefiles with point geometry and yield attribute
 """
 
 import pandas as pd
 import geopandas as gpd
+import pyarrow.parquet as pq
+import pyogrio
 from pathlib import Path
 from typing import Union, Dict, Optional, List
 import numpy as np
-from shapely.geometry import Point, Polygon, box
+from shapely import STRtree
+from shapely.geometry import Polygon, box
+import logging
 import warnings
 
+from src.jit import HAS_NUMBA, lazy_njit, prange
+
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+
+# Arrays at least this large use the Numba kernel (when numba is installed).
+# Below it the NumPy path is as fast, and importing numba plus loading or
+# compiling the kernel would dominate
+NUMBA_MIN_SIZE = 10_000_000
+
+
+def _yield_stats_numpy(y: np.ndarray, yield_min: float, yield_max: float) -> tuple:
+    """
+    Yield summary statistics (NumPy)
+    
+    Returns:
+        tuple: (n_nan, n_low, n_high, mean, std, min, max) over non-NaN values,
+        with sample std (ddof=1)
+    """
+    nan_mask = np.isnan(y)
+    n_nan = int(nan_mask.sum())
+    valid = y[~nan_mask] if n_nan > 0 else y
+    n = valid.size
+    if n == 0:
+        return n_nan, 0, 0, np.nan, np.nan, np.nan, np.nan
+    std = float(valid.std(ddof=1)) if n > 1 else np.nan
+    return (n_nan,
+            int(np.count_nonzero(valid < yield_min)),
+            int(np.count_nonzero(valid > yield_max)),
+            float(valid.mean()), std, float(valid.min()), float(valid.max()))
+
+
+@lazy_njit(parallel=True, cache=True)
+def _yield_stats_kernel(y, yield_min, yield_max):
+    """Numba yield-stats kernel, one parallel pass: NaN/range counts, shifted sums, min and max"""
+    # Shift by the first valid value so the sum of squares stays stable
+    shift = 0.0
+    for i in range(y.shape[0]):
+        if not np.isnan(y[i]):
+            shift = y[i]
+            break
+
+    n_nan = 0
+    n_low = 0
+    n_high = 0
+    total = 0.0
+    total_sq = 0.0
+    y_min = np.inf
+    y_max = -np.inf
+    for i in prange(y.shape[0]):
+        v = y[i]
+        if np.isnan(v):
+            n_nan += 1
+        else:
+            d = v - shift
+            total += d
+            total_sq += d * d
+            y_min = min(y_min, v)
+            y_max = max(y_max, v)
+            if v < yield_min:
+                n_low += 1
+            if v > yield_max:
+                n_high += 1
+    return n_nan, n_low, n_high, shift, total, total_sq, y_min, y_max
+
+
+def _yield_stats_numba(y: np.ndarray, yield_min: float, yield_max: float) -> tuple:
+    """Yield summary statistics, see _yield_stats_numpy (Numba kernel)"""
+    if y.dtype.kind != 'f':
+        y = y.astype(np.float64)
+    n_nan, n_low, n_high, shift, total, total_sq, y_min, y_max = \
+        _yield_stats_kernel()(y, float(yield_min), float(yield_max))
+    n = y.size - n_nan
+    if n == 0:
+        return n_nan, 0, 0, np.nan, np.nan, np.nan, np.nan
+    mean = shift + total / n
+    std = np.sqrt(max(total_sq - total * total / n, 0.0) / (n - 1)) if n > 1 else np.nan
+    return (n_nan, n_low, n_high,
+            float(mean), float(std), float(y_min), float(y_max))
+
+
+def _yield_stats(y: np.ndarray, yield_min: float, yield_max: float) -> tuple:
+    """Yield summary statistics, see _yield_stats_numpy (Numba for very large arrays)"""
+    if HAS_NUMBA and y.size >= NUMBA_MIN_SIZE:
+        return _yield_stats_numba(y, yield_min, yield_max)
+    return _yield_stats_numpy(y, yield_min, yield_max)
+
 
 class DataValidator:
     """Validates harvest data quality"""
@@ -58,24 +150,34 @@ class DataValidator:
             results['valid'] = False
             return results
         
-        # Yield statistics
-        yield_data = gdf['yield'].dropna()
-        results['stats']['yield_mean'] = float(yield_data.mean())
-        results['stats']['yield_std'] = float(yield_data.std())
-        results['stats']['yield_min'] = float(yield_data.min())
-        results['stats']['yield_max'] = float(yield_data.max())
-        results['stats']['yield_median'] = float(yield_data.median())
+        # Yield statistics in one pass over the raw array (a parallel Numba
+        # kernel for very large arrays): NaN count, range counts, mean, std,
+        # min, max
+        yield_all = gdf['yield'].to_numpy()
+        n_nan, outliers_low, outliers_high, y_mean, y_std, y_min, y_max = \
+            _yield_stats(yield_all, self.yield_min, self.yield_max)
+        results['stats']['yield_mean'] = y_mean
+        results['stats']['yield_std'] = y_std
+        results['stats']['yield_min'] = y_min
+        results['stats']['yield_max'] = y_max
+        
+        # Quartiles and median from one partition-based selection; the
+        # quartiles are reused by the IQR outlier cleaning
+        yield_data = yield_all[~np.isnan(yield_all)] if n_nan > 0 else yield_all
+        if yield_data.size > 0:
+            q1, median, q3 = np.quantile(yield_data, [0.25, 0.5, 0.75])
+        else:
+            q1 = median = q3 = np.nan
+        results['stats']['yield_median'] = float(median)
+        results['stats']['yield_q1'] = float(q1)
+        results['stats']['yield_q3'] = float(q3)
         
         # Check for NaN values
-        n_nan = gdf['yield'].isna().sum()
         if n_nan > 0:
             results['warnings'].append(f"{n_nan} points with missing yield values")
-            results['stats']['n_missing'] = int(n_nan)
-        
-        # Check yield range
-        outliers_low = (gdf['yield'] < self.yield_min).sum()
-        outliers_high = (gdf['yield'] > self.yield_max).sum()
+            results['stats']['n_missing'] = n_nan
         
+        # Check yield range (NaN values are not counted)
         if outliers_low > 0:
             results['warnings'].append(f"{outliers_low} points below minimum yield ({self.yield_min})")
             results['stats']['outliers_low'] = int(outliers_low)
@@ -84,7 +186,8 @@ class DataValidator:
             results['warnings'].append(f"{outliers_high} points above maximum yield ({self.yield_max})")
             results['stats']['outliers_high'] = int(outliers_high)
         
-        # Check coordinate validity
+        # Check coordinate validity (total_bounds is one vectorized GEOS
+        # bounds pass, faster than extracting x/y coordinate arrays)
         bounds = gdf.total_bounds
         results['stats']['bounds'] = {
             'min_lon': float(bounds[0]),
@@ -122,21 +225,76 @@ class HarvestDataReader:
         Returns:
             GeoDataFrame with point geometry
         """
-        df = pd.read_csv(filepath)
+        # Parse only the required columns, with known dtypes
+        # (yield as float32, coordinates keep float64 precision)
+        required = [lat_col, lon_col, yield_col]
+        df = pd.read_csv(
+            filepath,
+            usecols=lambda col: col in required,
+            dtype={lat_col: 'float64', lon_col: 'float64', yield_col: 'float32'}
+        )
         
-        # Check required columns
+        return HarvestDataReader.from_dataframe(df, lat_col, lon_col, yield_col, crs)
+    
+    @staticmethod
+    def read_parquet(filepath: Union[str, Path],
+                     lat_col: str = 'latitude',
+                     lon_col: str = 'longitude',
+                     yield_col: str = 'yield',
+                     crs: str = 'EPSG:4326') -> gpd.GeoDataFrame:
+        """
+        Read harvest data from Parquet
+        
+        Args:
+            filepath: Path to Parquet file
+            lat_col: Name of latitude column
+            lon_col: Name of longitude column
+            yield_col: Name of yield column
+            crs: Coordinate reference system
+            
+        Returns:
+            GeoDataFrame with point geometry
+        """
+        # Check required columns against the schema, then read only those
         required = [lat_col, lon_col, yield_col]
-        missing = [col for col in required if col not in df.columns]
+        available = pq.read_schema(filepath).names
+        missing = [col for col in required if col not in available]
         if missing:
             raise ValueError(f"Missing columns: {missing}")
         
-        # Create geometry
-        geometry = [Point(xy) for xy in zip(df[lon_col], df[lat_col])]
-        gdf = gpd.GeoDataFrame(df, geometry=geometry, crs=crs)
+        df = pd.read_parquet(filepath, columns=required)
         
-        # Standardize yield column name
-        if yield_col != 'yield':
-            gdf = gdf.rename(columns={yield_col: 'yield'})
+        return HarvestDataReader.from_dataframe(df, lat_col, lon_col, yield_col, crs)
+    
+    @staticmethod
+    def from_dataframe(df: pd.DataFrame,
+                       lat_col: str = 'latitude',
+                       lon_col: str = 'longitude',
+                       yield_col: str = 'yield',
+                       crs: str = 'EPSG:4326') -> gpd.GeoDataFrame:
+        """
+        Build harvest GeoDataFrame from an in-memory DataFrame
+        
+        Args:
+            df: DataFrame with coordinate and yield columns
+            lat_col: Name of latitude column
+            lon_col: Name of longitude column
+            yield_col: Name of yield column
+            crs: Coordinate reference system
+            
+        Returns:
+            GeoDataFrame with point geometry
+        """
+        required = [lat_col, lon_col, yield_col]
+        missing = [col for col in required if col not in df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+        
+        # Create geometry; yield is stored as float32 (ample for ton/ha)
+        geometry = gpd.points_from_xy(df[lon_col].to_numpy(), df[lat_col].to_numpy())
+        yield_values = df[yield_col].to_numpy(dtype=np.float32, copy=False)
+        gdf = gpd.GeoDataFrame({'yield': yield_values},
+                               geometry=geometry, crs=crs)
         
         return gdf[['geometry', 'yield']]
     
@@ -153,22 +311,40 @@ class HarvestDataReader:
         Returns:
             GeoDataFrame
         """
-        gdf = gpd.read_file(filepath)
+        info = pyogrio.read_info(filepath)
         
         # Check yield column
-        if yield_col not in gdf.columns:
+        if yield_col not in info['fields']:
             raise ValueError(f"Yield column '{yield_col}' not found")
         
+        # Read only the yield field (plus geometry) from GDAL
+        gdf = gpd.read_file(filepath, engine='pyogrio', use_arrow=True,
+                            columns=[yield_col])
+        
         # Ensure point geometry
-        if not all(gdf.geometry.geom_type == 'Point'):
+        if not HarvestDataReader._has_geometry_type(info, gdf, ('Point',)):
             raise ValueError("Shapefile must contain point geometry")
         
         # Standardize yield column name
         if yield_col != 'yield':
             gdf = gdf.rename(columns={yield_col: 'yield'})
+        gdf['yield'] = gdf['yield'].astype('float32')
         
         return gdf[['geometry', 'yield']]
     
+    @staticmethod
+    def _has_geometry_type(info: Dict, gdf: gpd.GeoDataFrame, allowed: tuple) -> bool:
+        """
+        Check geometry type from the layer metadata
+        
+        Only layers declared with mixed ('Unknown') geometry fall back to
+        checking every feature.
+        """
+        layer_type = info['geometry_type'].split()[0]  # drop Z/M suffix
+        if layer_type == 'Unknown':
+            return bool(gdf.geometry.geom_type.isin(allowed).all())
+        return layer_type in allowed
+    
     @staticmethod
     def read_boundary(filepath: Union[str, Path]) -> gpd.GeoDataFrame:
         """
@@ -178,121 +354,145 @@ class HarvestDataReader:
             filepath: Path to boundary shapefile
             
         Returns:
-            GeoDataFrame with polygon geometry
+            GeoDataFrame with polygon geometry (no attribute columns)
         """
-        gdf = gpd.read_file(filepath)
+        info = pyogrio.read_info(filepath)
+        # Geometry only; boundary attributes are not used
+        gdf = gpd.read_file(filepath, engine='pyogrio', use_arrow=True, columns=[])
         
         # Ensure polygon geometry
-        if not all(gdf.geometry.geom_type.isin(['Polygon', 'MultiPolygon'])):
+        if not HarvestDataReader._has_geometry_type(info, gdf, ('Polygon', 'MultiPolygon')):
             raise ValueError("Boundary must contain polygon geometry")
         
         return gdf
 
 
-def ingest_harvest_data(data_file: Union[str, Path],
+def ingest_harvest_data(data_file: Optional[Union[str, Path]] = None,
                         boundary_file: Optional[Union[str, Path]] = None,
                         file_type: str = 'auto',
                         validate: bool = True,
-                        clean_outliers: bool = True) -> tuple:
+                        clean_outliers: bool = True,
+                        dataframe: Optional[pd.DataFrame] = None) -> tuple:
     """
     Main ingestion function - reads and validates harvest data
     
     Args:
-        data_file: Path to harvest data (CSV or shapefile)
+        data_file: Path to harvest data (CSV, Parquet or shapefile)
         boundary_file: Optional path to field boundary shapefile
-        file_type: 'csv', 'shapefile', or 'auto' (detect from extension)
+        file_type: 'csv', 'parquet', 'shapefile', or 'auto' (detect from extension)
         validate: Run validation checks
         clean_outliers: Remove outliers during cleaning
+        dataframe: In-memory DataFrame with latitude, longitude, yield
+            columns, used instead of data_file
         
     Returns:
         tuple: (harvest_gdf, boundary_gdf, validation_results)
     """
-    data_path = Path(data_file)
-    
-    # Auto-detect file type
-    if file_type == 'auto':
-        ext = data_path.suffix.lower()
-        if ext == '.csv':
-            file_type = 'csv'
-        elif ext == '.shp':
-            file_type = 'shapefile'
-        else:
-            raise ValueError(f"Unknown file extension: {ext}. Specify file_type explicitly.")
-    
-    # Read data
-    print(f"📂 Reading {file_type} file: {data_path.name}")
+    if (data_file is None) == (dataframe is None):
+        raise ValueError("Provide exactly one of data_file or dataframe")
     
-    if file_type == 'csv':
-        harvest_gdf = HarvestDataReader.read_csv(data_path)
-    elif file_type == 'shapefile':
-        harvest_gdf = HarvestDataReader.read_shapefile(data_path)
+    if dataframe is not None:
+        logger.info("📂 Reading in-memory DataFrame")
+        harvest_gdf = HarvestDataReader.from_dataframe(dataframe)
     else:
-        raise ValueError(f"Unsupported file type: {file_type}")
+        data_path = Path(data_file)
+        
+        # Auto-detect file type
+        if file_type == 'auto':
+            ext = data_path.suffix.lower()
+            if ext == '.csv':
+                file_type = 'csv'
+            elif ext == '.parquet':
+                file_type = 'parquet'
+            elif ext == '.shp':
+                file_type = 'shapefile'
+            else:
+                raise ValueError(f"Unknown file extension: {ext}. Specify file_type explicitly.")
+        
+        # Read data
+        logger.info("📂 Reading %s file: %s", file_type, data_path.name)
+        
+        if file_type == 'csv':
+            harvest_gdf = HarvestDataReader.read_csv(data_path)
+        elif file_type == 'parquet':
+            harvest_gdf = HarvestDataReader.read_parquet(data_path)
+        elif file_type == 'shapefile':
+            harvest_gdf = HarvestDataReader.read_shapefile(data_path)
+        else:
+            raise ValueError(f"Unsupported file type: {file_type}")
     
-    print(f"   ✅ Loaded {len(harvest_gdf)} points")
+    logger.info("   ✅ Loaded %d points", len(harvest_gdf))
     
     # Read boundary if provided
     boundary_gdf = None
     if boundary_file:
         boundary_path = Path(boundary_file)
-        print(f"📂 Reading boundary: {boundary_path.name}")
+        logger.info("📂 Reading boundary: %s", boundary_path.name)
         boundary_gdf = HarvestDataReader.read_boundary(boundary_path)
         
-        # Clip points to boundary
-        harvest_gdf = gpd.sjoin(harvest_gdf, boundary_gdf, predicate='within', how='inner')
-        harvest_gdf = harvest_gdf[['geometry', 'yield']]
-        print(f"   ✅ {len(harvest_gdf)} points within boundary")
+        # Clip points to boundary (each point kept once, even if it falls
+        # within several boundary polygons)
+        tree = STRtree(boundary_gdf.geometry.values)
+        point_idx, _ = tree.query(harvest_gdf.geometry.values, predicate='within')
+        harvest_gdf = harvest_gdf.iloc[np.unique(point_idx)]
+        logger.info("   ✅ %d points within boundary", len(harvest_gdf))
     
     # Validate
     validation_results = None
     if validate:
-        print(f"🔍 Validating data quality...")
+        logger.info("🔍 Validating data quality...")
         validator = DataValidator()
         validation_results = validator.validate(harvest_gdf)
         
         if validation_results['valid']:
-            print(f"   ✅ Validation passed")
+            logger.info("   ✅ Validation passed")
         else:
-            print(f"   ❌ Validation failed:")
+            logger.warning("   ❌ Validation failed:")
             for error in validation_results['errors']:
-                print(f"      - {error}")
+                logger.warning("      - %s", error)
         
         if validation_results['warnings']:
-            print(f"   ⚠️  Warnings:")
+            logger.warning("   ⚠️  Warnings:")
             for warning in validation_results['warnings']:
-                print(f"      - {warning}")
+                logger.warning("      - %s", warning)
         
-        # Print statistics
+        # Log statistics
         stats = validation_results['stats']
-        print(f"\n📊 Data Statistics:")
-        print(f"   Points: {stats['n_points']}")
-        print(f"   Yield: {stats['yield_mean']:.1f} ± {stats['yield_std']:.1f} ton/ha")
-        print(f"   Range: {stats['yield_min']:.1f} - {stats['yield_max']:.1f} ton/ha")
-        print(f"   Median: {stats['yield_median']:.1f} ton/ha")
+        logger.info("\n📊 Data Statistics:")
+        logger.info("   Points: %d", stats['n_points'])
+        logger.info("   Yield: %.1f ± %.1f ton/ha", stats['yield_mean'], stats['yield_std'])
+        logger.info("   Range: %.1f - %.1f ton/ha", stats['yield_min'], stats['yield_max'])
+        logger.info("   Median: %.1f ton/ha", stats['yield_median'])
     
     # Clean outliers
     if clean_outliers:
-        print(f"\n🧹 Cleaning outliers...")
+        logger.info("\n🧹 Cleaning outliers...")
         initial_count = len(harvest_gdf)
         
-        # Remove extreme outliers (IQR method)
-        Q1 = harvest_gdf['yield'].quantile(0.25)
-        Q3 = harvest_gdf['yield'].quantile(0.75)
+        # Remove extreme outliers (IQR method). Quartiles come from validation
+        # when it ran on this same data, otherwise from one np.quantile call,
+        # which selects with np.partition instead of sorting
+        yield_values = harvest_gdf['yield'].to_numpy()
+        if validation_results is not None and 'yield_q1' in validation_results['stats']:
+            Q1 = validation_results['stats']['yield_q1']
+            Q3 = validation_results['stats']['yield_q3']
+        else:
+            valid = yield_values[~np.isnan(yield_values)]
+            Q1, Q3 = np.quantile(valid, [0.25, 0.75]) if valid.size else (np.nan, np.nan)
         IQR = Q3 - Q1
         
         lower_bound = Q1 - 3 * IQR
         upper_bound = Q3 + 3 * IQR
         
         harvest_gdf = harvest_gdf[
-            (harvest_gdf['yield'] >= lower_bound) & 
-            (harvest_gdf['yield'] <= upper_bound)
+            (yield_values >= lower_bound) & (yield_values <= upper_bound)
         ]
         
         removed = initial_count - len(harvest_gdf)
         if removed > 0:
-            print(f"   ✅ Removed {removed} outliers ({removed/initial_count*100:.1f}%)")
+            logger.info("   ✅ Removed %d outliers (%.1f%%)", removed, removed / initial_count * 100)
         else:
-            print(f"   ✅ No outliers found")
+            logger.info("   ✅ No outliers found")
     
     return harvest_gdf, boundary_gdf, validation_results
 
@@ -0,0 +1,46 @@
+"""
+Precision Agriculture Platform - Optional Numba JIT Kernels
+Lazy compilation helpers shared by the numeric kernels
+
+numba is optional (pip install precision-agriculture-platform[fast]).
+Modules check HAS_NUMBA and only use a kernel for large inputs, so numba
+is imported and the kernel compiled (or loaded from the on-disk cache)
+the first time a large input is processed.
+"""
+
+import importlib.util
+import types
+from functools import lru_cache
+
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+
+# Placeholder for numba.prange in kernel source; lazy_njit binds the real
+# one at compile time. As plain Python the kernels run with range.
+prange = range
+
+
+def lazy_njit(**options):
+    """
+    Decorator: compile the function with numba.njit(**options) on first use
+
+    The decorated name becomes a zero-argument function returning the
+    compiled kernel, e.g. ``kernel()(x, y)``. ``prange`` in the kernel
+    (imported from this module) is bound to numba.prange.
+    """
+    def decorate(func):
+        @lru_cache(maxsize=None)
+        def compiled():
+            import numba
+
+            jit_globals = {**func.__globals__, 'prange': numba.prange}
+            py_func = types.FunctionType(func.__code__, jit_globals, func.__name__,
+                                         func.__defaults__, func.__closure__)
+            py_func.__qualname__ = func.__qualname__
+            py_func.__module__ = func.__module__
+            py_func.__doc__ = func.__doc__
+            return numba.njit(**options)(py_func)
+
+        compiled.__doc__ = func.__doc__
+        return compiled
+
+    return decorate
@@ -13,15 +13,23 @@ from folium import plugins
 import geopandas as gpd
 import pandas as pd
 import numpy as np
+import shapely
 from pathlib import Path
 from datetime import datetime
 import json
+import logging
+import re
 from typing import Optional, Dict, List
 import base64
 from io import BytesIO
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+logger = logging.getLogger(__name__)
+
+# Template placeholders, written as ${NAME}
+_PLACEHOLDER_RE = re.compile(r'\$\{(\w+)\}')
 
 
 class MapGenerator:
@@ -44,17 +52,15 @@ class MapGenerator:
         Returns:
             folium.Map object
         """
-        # Ensure geographic CRS
-        if not harvest_gdf.crs.is_geographic:
-            harvest_gdf = harvest_gdf.to_crs('EPSG:4326')
-        
-        if zones_gdf is not None and not zones_gdf.crs.is_geographic:
-            zones_gdf = zones_gdf.to_crs('EPSG:4326')
+        # Ensure WGS84 (folium expects lat/lon degrees)
+        harvest_gdf = MapGenerator._to_wgs84(harvest_gdf)
+        if zones_gdf is not None:
+            zones_gdf = MapGenerator._to_wgs84(zones_gdf)
         
-        # Calculate center
+        # Calculate center (middle of the bounding box)
         if center is None:
-            centroid = harvest_gdf.dissolve().centroid.iloc[0]
-            center = (centroid.y, centroid.x)
+            min_x, min_y, max_x, max_y = harvest_gdf.total_bounds
+            center = ((min_y + max_y) / 2, (min_x + max_x) / 2)
         
         # Create base map
         m = folium.Map(
@@ -72,35 +78,46 @@ class MapGenerator:
             control=True
         ).add_to(m)
         
-        # Add zone polygons
-        if zones_gdf is not None:
+        # Add zone polygons (the tooltip needs at least one feature)
+        if zones_gdf is not None and len(zones_gdf) > 0:
             # Color palette
             colors = ['#d73027', '#fc8d59', '#fee08b', '#d9ef8b', '#91cf60', '#1a9850']
             
-            for idx, row in zones_gdf.iterrows():
-                zone_id = row['zone_id']
-                color = colors[zone_id % len(colors)]
-                
-                folium.GeoJson(
-                    row['geometry'],
-                    name=row['zone_name'],
-                    style_function=lambda x, c=color: {
-                        'fillColor': c,
-                        'color': c,
-                        'weight': 2,
-                        'fillOpacity': 0.3
-                    },
-                    tooltip=folium.Tooltip(
-                        f"<b>{row['zone_name']}</b><br>"
-                        f"Yield: {row['yield_mean']:.1f} ± {row['yield_std']:.1f} ton/ha<br>"
-                        f"Points: {row['n_points']}<br>"
-                        f"Area: {row['area_ha']:.1f} ha"
-                    )
-                ).add_to(m)
-        
-        # Add harvest points with heatmap
-        heat_data = [[point.y, point.x, val] for point, val in 
-                     zip(harvest_gdf.geometry, harvest_gdf['yield'])]
+            # One GeoJSON layer for all zones; style and tooltip are read
+            # from each feature's properties
+            zone_layer = zones_gdf[['zone_id', 'geometry']].assign(tooltip=[
+                f"<b>{zone_name}</b><br>"
+                f"Yield: {yield_mean:.1f} ± {yield_std:.1f} ton/ha<br>"
+                f"Points: {n_points}<br>"
+                f"Area: {area_ha:.1f} ha"
+                for zone_name, yield_mean, yield_std, n_points, area_ha in zip(
+                    zones_gdf['zone_name'], zones_gdf['yield_mean'], zones_gdf['yield_std'],
+                    zones_gdf['n_points'], zones_gdf['area_ha']
+                )
+            ])
+            
+            def zone_style(feature):
+                color = colors[feature['properties']['zone_id'] % len(colors)]
+                return {
+                    'fillColor': color,
+                    'color': color,
+                    'weight': 2,
+                    'fillOpacity': 0.3
+                }
+            
+            folium.GeoJson(
+                zone_layer,
+                name='Management Zones',
+                style_function=zone_style,
+                tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False)
+            ).add_to(m)
+        
+        # Add harvest points with heatmap ([lat, lon, yield] rows)
+        coords = shapely.get_coordinates(harvest_gdf.geometry.values)
+        yield_values = harvest_gdf['yield'].to_numpy()
+        heat_data = np.column_stack(
+            [coords[:, 1], coords[:, 0], yield_values]
+        ).tolist()
         
         plugins.HeatMap(
             heat_data,
@@ -117,17 +134,17 @@ class MapGenerator:
         
         # Add point markers (sample for performance)
         sample_size = min(500, len(harvest_gdf))
-        sample_indices = np.random.choice(len(harvest_gdf), sample_size, replace=False)
+        rng = np.random.default_rng()
+        sample_indices = rng.choice(len(harvest_gdf), sample_size, replace=False, shuffle=False)
         
         marker_cluster = plugins.MarkerCluster(name='Sample Points')
         
-        for idx in sample_indices:
-            row = harvest_gdf.iloc[idx]
-            point = row['geometry']
-            yield_val = row['yield']
-            
+        sample_coords = coords[sample_indices]
+        sample_yields = yield_values[sample_indices]
+        
+        for (x, y), yield_val in zip(sample_coords.tolist(), sample_yields.tolist()):
             folium.CircleMarker(
-                location=[point.y, point.x],
+                location=[y, x],
                 radius=3,
                 popup=f"Yield: {yield_val:.2f} ton/ha",
                 color='black',
@@ -146,6 +163,21 @@ class MapGenerator:
         
         return m
     
+    @staticmethod
+    def _to_wgs84(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """
+        Return gdf in EPSG:4326, reprojecting only when needed
+        
+        Data without a CRS is assumed to already be WGS84, matching the
+        readers' default. Other geographic CRS (e.g. EPSG:4269) are still
+        transformed.
+        """
+        if gdf.crs is None:
+            return gdf.set_crs('EPSG:4326')
+        if gdf.crs.to_epsg() != 4326:
+            return gdf.to_crs('EPSG:4326')
+        return gdf
+    
     @staticmethod
     def create_yield_histogram(yield_values: np.ndarray, 
                                zones_gdf: Optional[gpd.GeoDataFrame] = None) -> str:
@@ -155,11 +187,16 @@ class MapGenerator:
         Returns:
             Base64 encoded PNG image
         """
-        fig, ax = plt.subplots(figsize=(10, 6))
+        # Standalone Agg figure at the embed size: no pyplot state to close,
+        # and the fixed layout avoids the bbox_inches='tight' second render
+        fig = Figure(figsize=(8, 4), dpi=80, layout='tight')
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
         
-        # Overall histogram
-        ax.hist(yield_values, bins=30, alpha=0.5, color='steelblue', 
-               edgecolor='black', label='All Points')
+        # Overall histogram (binned in NumPy, drawn as a single bar container)
+        counts, edges = np.histogram(yield_values, bins=30)
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.5,
+               color='steelblue', edgecolor='black', label='All Points')
         
         # Zone histograms
         if zones_gdf is not None:
@@ -179,29 +216,19 @@ class MapGenerator:
         
         # Convert to base64
         buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
-        buffer.seek(0)
-        img_base64 = base64.b64encode(buffer.read()).decode()
-        plt.close()
-        
-        return img_base64
+        canvas.print_png(buffer)
+        return base64.b64encode(buffer.getbuffer()).decode()
 
 
-class ReportGenerator:
-    """Generate HTML reports"""
-    
-    def __init__(self):
-        self.template = self._get_template()
-    
-    def _get_template(self) -> str:
-        """HTML report template"""
-        return """
+# HTML report template, split once at import into alternating
+# text / placeholder-name chunks for rendering
+_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Precision Agriculture Report - {{REPORT_DATE}}</title>
+    <title>Precision Agriculture Report - ${REPORT_DATE}</title>
     <style>
         body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -314,25 +341,25 @@ class ReportGenerator:
         <h1>🌾 Precision Agriculture Report</h1>
         
         <div class="metadata">
-            <p><strong>Generated:</strong> {{REPORT_DATE}}</p>
-            <p><strong>Field:</strong> {{FIELD_NAME}}</p>
-            <p><strong>Data Points:</strong> {{N_POINTS}}</p>
-            <p><strong>Management Zones:</strong> {{N_ZONES}}</p>
+            <p><strong>Generated:</strong> ${REPORT_DATE}</p>
+            <p><strong>Field:</strong> ${FIELD_NAME}</p>
+            <p><strong>Data Points:</strong> ${N_POINTS}</p>
+            <p><strong>Management Zones:</strong> ${N_ZONES}</p>
         </div>
         
         <h2>📊 Summary Statistics</h2>
         <div class="stats-grid">
-            {{STATS_CARDS}}
+            ${STATS_CARDS}
         </div>
         
         <h2>🗺️ Interactive Map</h2>
         <div class="map-container">
-            {{MAP_HTML}}
+            ${MAP_HTML}
         </div>
         
         <h2>📈 Yield Distribution</h2>
         <div class="chart-container">
-            <img src="data:image/png;base64,{{HISTOGRAM_BASE64}}" alt="Yield Histogram">
+            <img src="data:image/png;base64,${HISTOGRAM_BASE64}" alt="Yield Histogram">
         </div>
         
         <h2>🎯 Management Zones</h2>
@@ -348,7 +375,7 @@ class ReportGenerator:
                 </tr>
             </thead>
             <tbody>
-                {{ZONE_ROWS}}
+                ${ZONE_ROWS}
             </tbody>
         </table>
         
@@ -360,12 +387,23 @@ class ReportGenerator:
 </body>
 </html>
         """
+
+_TEMPLATE_CHUNKS = tuple(_PLACEHOLDER_RE.split(_TEMPLATE))
+
+
+class ReportGenerator:
+    """Generate HTML reports"""
+    
+    def __init__(self):
+        self.template = _TEMPLATE
+        self.template_chunks = _TEMPLATE_CHUNKS
     
     def generate(self, 
                  harvest_gdf: gpd.GeoDataFrame,
                  zones_gdf: Optional[gpd.GeoDataFrame] = None,
                  field_name: str = "Unnamed Field",
-                 output_file: Optional[Path] = None) -> str:
+                 output_file: Optional[Path] = None,
+                 stats: Optional[Dict] = None) -> Optional[str]:
         """
         Generate complete HTML report
         
@@ -374,32 +412,39 @@ class ReportGenerator:
             zones_gdf: Management zones
             field_name: Field identifier
             output_file: Output path (if None, returns HTML string)
+            stats: Precomputed yield statistics for harvest_gdf (e.g.
+                validation_results['stats']); computed here if None
             
         Returns:
-            HTML string
+            HTML string, or None when the report is streamed to output_file
         """
-        print(f"\n📄 Generating Report...")
+        logger.info("\n📄 Generating Report...")
         
         # Generate map
-        print(f"   🗺️  Creating interactive map...")
+        logger.info("   🗺️  Creating interactive map...")
         map_obj = MapGenerator.create_harvest_map(harvest_gdf, zones_gdf)
         map_html = map_obj._repr_html_()
         
         # Generate histogram
-        print(f"   📊 Creating yield histogram...")
+        logger.info("   📊 Creating yield histogram...")
         histogram_base64 = MapGenerator.create_yield_histogram(
             harvest_gdf['yield'].values, zones_gdf
         )
         
-        # Calculate statistics
-        yield_values = harvest_gdf['yield'].values
+        # Calculate statistics (unless provided by the caller)
+        if stats is None:
+            # NaN-aware, sample std (ddof=1) as in DataValidator
+            yield_values = harvest_gdf['yield'].to_numpy(dtype=np.float64)
+            stats = {
+                'yield_mean': float(np.nanmean(yield_values)),
+                'yield_median': float(np.nanmedian(yield_values)),
+                'yield_std': float(np.nanstd(yield_values, ddof=1)),
+                'yield_min': float(np.nanmin(yield_values)),
+                'yield_max': float(np.nanmax(yield_values)),
+            }
         stats = {
+            **stats,
             'n_points': len(harvest_gdf),
-            'yield_mean': float(yield_values.mean()),
-            'yield_median': float(np.median(yield_values)),
-            'yield_std': float(yield_values.std()),
-            'yield_min': float(yield_values.min()),
-            'yield_max': float(yield_values.max()),
             'n_zones': len(zones_gdf) if zones_gdf is not None else 0
         }
         
@@ -427,58 +472,73 @@ class ReportGenerator:
             </div>
         """
         
-        # Build zone table
-        zone_rows_html = ""
+        # Build zone table (recommendation thresholds computed once for all zones)
         if zones_gdf is not None:
-            for _, row in zones_gdf.iterrows():
-                yield_mean = row['yield_mean']
-                
-                # Simple recommendation logic
-                if yield_mean < stats['yield_mean'] - 0.5 * stats['yield_std']:
-                    recommendation = "🔴 Increase inputs"
-                elif yield_mean > stats['yield_mean'] + 0.5 * stats['yield_std']:
-                    recommendation = "🟢 Maintain/reduce inputs"
-                else:
-                    recommendation = "🟡 Standard management"
-                
-                zone_rows_html += f"""
+            zone_means = zones_gdf['yield_mean'].to_numpy()
+            low = stats['yield_mean'] - 0.5 * stats['yield_std']
+            high = stats['yield_mean'] + 0.5 * stats['yield_std']
+            
+            # Simple recommendation logic
+            recommendations = np.select(
+                [zone_means < low, zone_means > high],
+                ["🔴 Increase inputs", "🟢 Maintain/reduce inputs"],
+                default="🟡 Standard management"
+            )
+            
+            zone_rows_html = "".join(
+                f"""
                     <tr>
-                        <td><strong>{row['zone_name']}</strong></td>
-                        <td>{row['n_points']}</td>
-                        <td>{row['yield_mean']:.2f}</td>
-                        <td>{row['yield_std']:.2f}</td>
-                        <td>{row['area_ha']:.1f}</td>
+                        <td><strong>{zone_name}</strong></td>
+                        <td>{n_points}</td>
+                        <td>{yield_mean:.2f}</td>
+                        <td>{yield_std:.2f}</td>
+                        <td>{area_ha:.1f}</td>
                         <td>{recommendation}</td>
                     </tr>
                 """
+                for zone_name, n_points, yield_mean, yield_std, area_ha, recommendation in zip(
+                    zones_gdf['zone_name'], zones_gdf['n_points'], zone_means,
+                    zones_gdf['yield_std'], zones_gdf['area_ha'], recommendations
+                )
+            )
         else:
             zone_rows_html = "<tr><td colspan='6' style='text-align:center;'>No zones defined</td></tr>"
         
-        # Fill template
-        html = self.template
-        html = html.replace('{{REPORT_DATE}}', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-        html = html.replace('{{FIELD_NAME}}', field_name)
-        html = html.replace('{{N_POINTS}}', str(stats['n_points']))
-        html = html.replace('{{N_ZONES}}', str(stats['n_zones']))
-        html = html.replace('{{STATS_CARDS}}', stats_cards_html)
-        html = html.replace('{{MAP_HTML}}', map_html)
-        html = html.replace('{{HISTOGRAM_BASE64}}', histogram_base64)
-        html = html.replace('{{ZONE_ROWS}}', zone_rows_html)
-        
-        # Save to file
+        values = {
+            'REPORT_DATE': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'FIELD_NAME': field_name,
+            'N_POINTS': str(stats['n_points']),
+            'N_ZONES': str(stats['n_zones']),
+            'STATS_CARDS': stats_cards_html,
+            'MAP_HTML': map_html,
+            'HISTOGRAM_BASE64': histogram_base64,
+            'ZONE_ROWS': zone_rows_html
+        }
+        
+        # Stream to file without building the full document in memory
         if output_file:
             output_path = Path(output_file)
             output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(html, encoding='utf-8')
-            print(f"   ✅ Report saved: {output_path}")
+            with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                for chunk in self._render(values):
+                    f.write(chunk)
+            logger.info("   ✅ Report saved: %s", output_path)
+            return None
         
-        return html
+        return ''.join(self._render(values))
+    
+    def _render(self, values: Dict[str, str]):
+        """Yield template text and substituted values in document order"""
+        # Chunks alternate text, name, text, ... (re.split with one group)
+        for i, chunk in enumerate(self.template_chunks):
+            yield values[chunk] if i % 2 else chunk
 
 
 def generate_report(harvest_gdf: gpd.GeoDataFrame,
                    zones_gdf: Optional[gpd.GeoDataFrame] = None,
                    field_name: str = "Unnamed Field",
-                   output_file: Optional[str] = None) -> str:
+                   output_file: Optional[str] = None,
+                   stats: Optional[Dict] = None) -> Optional[str]:
     """
     Generate precision agriculture report
     
@@ -486,13 +546,14 @@ def generate_report(harvest_gdf: gpd.GeoDataFrame,
         harvest_gdf: Harvest data
         zones_gdf: Management zones
         field_name: Field name
-        output_file: Output HTML file path
+        output_file: Output HTML file path (if None, returns HTML string)
+        stats: Precomputed yield statistics for harvest_gdf
         
     Returns:
-        HTML string
+        HTML string, or None when the report is written to output_file
     """
     generator = ReportGenerator()
-    return generator.generate(harvest_gdf, zones_gdf, field_name, output_file)
+    return generator.generate(harvest_gdf, zones_gdf, field_name, output_file, stats)
 
 
 if __name__ == "__main__":
@@ -502,7 +563,7 @@ if __name__ == "__main__":
     print("Usage:")
     print("  from src.report import generate_report")
     print()
-    print("  html = generate_report(")
+    print("  generate_report(")
     print("      harvest_gdf,")
     print("      zones_gdf,")
     print("      field_name='Field A',")
@@ -5,37 +5,95 @@ IDW interpolation and zone clustering for variable rate management
 Algorithms:
 - Inverse Distance Weighting (IDW) for spatial interpolation
 - K-Means clustering for zone delineation
-- Silhouette analysis for optimal cluster count
+- Inertia elbow analysis for optimal cluster count
 """
 
 import numpy as np
 import pandas as pd
 import geopandas as gpd
-from scipy.spatial import cKDTree
+from scipy.spatial import cKDTree, ConvexHull, Delaunay, QhullError
 from scipy.interpolate import griddata
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
-from shapely.geometry import Point, Polygon
+from shapely.geometry import Point, Polygon, MultiPoint
 from typing import Optional, Tuple, List
+import importlib.util
 import warnings
 
+from src.jit import HAS_NUMBA, lazy_njit, prange
+
+# Optional backends are imported when selected, not on module load
+HAS_CUPY = importlib.util.find_spec('cupy') is not None
+HAS_FAISS = importlib.util.find_spec('faiss') is not None
+
 warnings.filterwarnings('ignore')
 
+# Grid points interpolated per predict() call
+GRID_TILE_SIZE = 4096
+
+
+# Interpolations over at least this many points use the Numba IDW kernel
+# (when numba is installed). The neighbor query dominates either way, so the
+# kernel's gain only outweighs importing numba plus loading or compiling it
+# on large grids
+NUMBA_MIN_POINTS = 1_000_000
+
+
+@lazy_njit(parallel=True, fastmath=True, cache=True)
+def _idw_kernel(distances, indices, values, power, half_power, out):
+    """Numba IDW kernel: fused weighting, gather and normalization (one pass, no temporaries)"""
+    for i in prange(distances.shape[0]):
+        num = 0.0
+        den = 0.0
+        for j in range(distances.shape[1]):
+            # Avoid division by zero for exact matches
+            d = distances[i, j]
+            if half_power == 1:
+                w = 1.0 / max(d * d, 1e-20)
+            elif half_power > 1:
+                w = 1.0 / max(d * d, 1e-20) ** half_power
+            else:
+                w = 1.0 / max(d, 1e-10) ** power
+            num += w * values[indices[i, j]]
+            den += w
+        out[i] = num / den
+
 
 class IDWInterpolator:
     """Inverse Distance Weighting interpolation"""
     
-    def __init__(self, power: float = 2.0, max_neighbors: int = 12):
+    def __init__(self, power: float = 2.0, max_neighbors: int = 12,
+                 backend: str = 'cpu', neighbor_search: str = 'kdtree'):
         """
         Args:
             power: IDW power parameter (higher = more local influence)
             max_neighbors: Maximum number of neighbors for interpolation
+            backend: 'cpu', or 'gpu' to compute the weighting with CuPy
+                (neighbor search stays on the CPU)
+            neighbor_search: 'kdtree' (cKDTree), or 'faiss' for an exact
+                brute-force FAISS index (batched SIMD distances, O(n) per
+                query; only pays off with many cores and few points)
         """
+        if backend not in ('cpu', 'gpu'):
+            raise ValueError(f"Unknown backend: {backend}. Use 'cpu' or 'gpu'.")
+        if backend == 'gpu' and not HAS_CUPY:
+            raise ImportError("backend='gpu' requires cupy")
+        if neighbor_search not in ('kdtree', 'faiss'):
+            raise ValueError(f"Unknown neighbor_search: {neighbor_search}. "
+                             "Use 'kdtree' or 'faiss'.")
+        if neighbor_search == 'faiss' and not HAS_FAISS:
+            raise ImportError("neighbor_search='faiss' requires faiss")
+        
         self.power = power
         self.max_neighbors = max_neighbors
+        self.backend = backend
+        self.neighbor_search = neighbor_search
         self.tree = None
+        self.index = None
+        self.origin = None
+        self.points = None
         self.values = None
+        self._values_gpu = None
     
     def fit(self, points: np.ndarray, values: np.ndarray):
         """
@@ -45,8 +103,27 @@ class IDWInterpolator:
             points: Array of (x, y) coordinates, shape (n, 2)
             values: Array of values, shape (n,)
         """
-        self.tree = cKDTree(points)
-        self.values = values
+        # Coordinates stay float64 for cKDTree (it works in float64 and
+        # absolute UTM values need the precision); values are float32
+        if self.neighbor_search == 'faiss':
+            import faiss
+            
+            # FAISS indexes float32: store offsets from the data origin,
+            # which keep sub-millimetre precision within a field
+            points = np.asarray(points, dtype=np.float64)
+            self.origin = points.min(axis=0)
+            self.index = faiss.IndexFlatL2(points.shape[1])
+            self.index.add(np.ascontiguousarray(points - self.origin, dtype=np.float32))
+            self.points = points
+        else:
+            # Sliding-midpoint splits build faster than median splits and
+            # query as fast here (leafsize stays 16: larger leaves slowed
+            # the k-neighbor queries)
+            self.tree = cKDTree(points, balanced_tree=False, compact_nodes=False)
+        self.values = np.ascontiguousarray(values, dtype=np.float32)
+        if self.backend == 'gpu':
+            import cupy as cp
+            self._values_gpu = cp.asarray(self.values)
     
     def predict(self, grid_points: np.ndarray) -> np.ndarray:
         """
@@ -56,26 +133,59 @@ class IDWInterpolator:
             grid_points: Array of (x, y) coordinates, shape (m, 2)
             
         Returns:
-            Interpolated values, shape (m,)
+            Interpolated values (float32), shape (m,)
         """
-        if self.tree is None:
+        return self._predict(grid_points,
+                             use_numba=HAS_NUMBA and len(grid_points) >= NUMBA_MIN_POINTS)
+    
+    def _predict(self, grid_points: np.ndarray, use_numba: bool) -> np.ndarray:
+        """predict() with the Numba/NumPy weighting path chosen by the caller"""
+        if self.values is None:
             raise ValueError("Interpolator not fitted. Call fit() first.")
         
+        # A single (x, y) point is accepted as a one-row array by both
+        # neighbor searches
+        grid_points = np.atleast_2d(grid_points)
+        
         # Query nearest neighbors
-        distances, indices = self.tree.query(
-            grid_points, 
-            k=min(self.max_neighbors, len(self.values))
-        )
+        k = min(self.max_neighbors, len(self.values))
+        if self.neighbor_search == 'faiss':
+            _, indices = self.index.search(
+                np.ascontiguousarray(grid_points - self.origin, dtype=np.float32), k
+            )
+            # FAISS float32 squared distances lose precision near exact
+            # matches, so recompute the k distances in float64
+            offsets = self.points[indices] - grid_points[:, None, :]
+            distances = np.sqrt((offsets * offsets).sum(axis=2))
+        else:
+            distances, indices = self.tree.query(grid_points, k=k, workers=-1)
         
-        # Handle single point case
+        # Handle single neighbor case (cKDTree drops the k axis for k=1)
         if distances.ndim == 1:
-            distances = distances.reshape(1, -1)
-            indices = indices.reshape(1, -1)
+            distances = distances.reshape(-1, 1)
+            indices = indices.reshape(-1, 1)
+        
+        # Even integer powers work on squared distances (d^2k = (d*d)^k),
+        # replacing the float power with multiplications
+        half_power = int(self.power) // 2 if self.power > 0 and self.power % 2 == 0 else 0
+        
+        if self.backend == 'gpu':
+            return self._predict_gpu(distances, indices, half_power)
+        
+        if use_numba:
+            interpolated = np.empty(distances.shape[0], dtype=np.float32)
+            _idw_kernel()(distances, indices, self.values, float(self.power), half_power,
+                          interpolated)
+            return interpolated
         
         # Calculate IDW weights
         # Avoid division by zero for exact matches
-        distances = np.maximum(distances, 1e-10)
-        weights = 1.0 / np.power(distances, self.power)
+        if half_power:
+            d_sq = np.maximum(distances * distances, 1e-20)
+            weights = 1.0 / (d_sq if half_power == 1 else np.power(d_sq, half_power))
+        else:
+            distances = np.maximum(distances, 1e-10)
+            weights = 1.0 / np.power(distances, self.power)
         
         # Normalize weights
         weights = weights / weights.sum(axis=1, keepdims=True)
@@ -83,7 +193,21 @@ class IDWInterpolator:
         # Weighted average
         interpolated = (weights * self.values[indices]).sum(axis=1)
         
-        return interpolated
+        return interpolated.astype(np.float32)
+    
+    def _predict_gpu(self, distances: np.ndarray, indices: np.ndarray,
+                     half_power: int) -> np.ndarray:
+        """IDW weighting and weighted average on the GPU (CuPy)"""
+        import cupy as cp
+        
+        d = cp.asarray(distances)
+        if half_power:
+            w = 1.0 / cp.maximum(d * d, 1e-20) ** half_power
+        else:
+            w = 1.0 / cp.maximum(d, 1e-10) ** self.power
+        
+        interpolated = (w * self._values_gpu[cp.asarray(indices)]).sum(axis=1) / w.sum(axis=1)
+        return cp.asnumpy(interpolated.astype(cp.float32))
     
     def interpolate_grid(self, bounds: Tuple[float, float, float, float],
                         resolution: float = 10.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
@@ -95,23 +219,51 @@ class IDWInterpolator:
             resolution: Grid cell size in meters
             
         Returns:
-            tuple: (grid_x, grid_y, grid_values)
+            tuple: (grid_x, grid_y, grid_values); grid_x and grid_y are
+            read-only broadcast views of the 1-D axes, grid_values is float32
         """
         min_x, min_y, max_x, max_y = bounds
         
-        # Create grid
+        # Create grid (broadcast views of the axes, no 2-D allocation)
         x = np.arange(min_x, max_x, resolution)
         y = np.arange(min_y, max_y, resolution)
-        grid_x, grid_y = np.meshgrid(x, y)
+        shape = (y.size, x.size)
+        grid_x = np.broadcast_to(x, shape)
+        grid_y = np.broadcast_to(y[:, None], shape)
         
-        # Interpolate
-        grid_points = np.c_[grid_x.ravel(), grid_y.ravel()]
-        grid_values = self.predict(grid_points)
-        grid_values = grid_values.reshape(grid_x.shape)
+        # Interpolate in tiles so the per-query k-neighbor arrays stay
+        # small (bounded memory, cache-resident) on large grids; tile
+        # coordinates are gathered from the axes by flat cell index
+        grid_values = np.empty(shape, dtype=np.float32)
+        flat_values = grid_values.reshape(-1)
+        # The weighting path is chosen once for the whole grid, not per tile
+        use_numba = HAS_NUMBA and flat_values.size >= NUMBA_MIN_POINTS
+        for start in range(0, flat_values.size, GRID_TILE_SIZE):
+            stop = min(start + GRID_TILE_SIZE, flat_values.size)
+            rows, cols = np.divmod(np.arange(start, stop), x.size)
+            flat_values[start:stop] = self._predict(np.column_stack([x[cols], y[rows]]),
+                                                    use_numba)
         
         return grid_x, grid_y, grid_values
 
 
+class _YieldScaler:
+    """Minimal standard scaler for a single (yield) feature column"""
+    
+    def __init__(self):
+        self.mean_ = None
+        self.scale_ = None
+    
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        self.mean_ = X.mean()
+        # Population std, constant input left unscaled (as StandardScaler)
+        self.scale_ = X.std() or 1.0
+        return self.transform(X)
+    
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (X - self.mean_) / self.scale_
+
+
 class ZoneDelineator:
     """Management zone delineation using clustering"""
     
@@ -130,36 +282,55 @@ class ZoneDelineator:
         self.model = None
         self.scaler = StandardScaler()
         self.optimal_n_zones = None
+        self.label_map = None
     
-    def _find_optimal_zones(self, X: np.ndarray) -> int:
+    def _find_optimal_zones(self, X: np.ndarray) -> Tuple[int, KMeans, np.ndarray]:
         """
-        Find optimal number of zones using silhouette analysis
+        Find optimal number of zones using the inertia elbow
+        
+        The elbow is the k whose inertia drop from k-1 is largest relative
+        to the drop to k+1: (I[k-1] - I[k]) / (I[k] - I[k+1]). The ratio
+        is scale-free, and KMeans is also fitted for min_zones - 1 and
+        max_zones + 1 so every candidate has neighbors on both sides.
         
         Args:
             X: Feature matrix
             
         Returns:
-            Optimal number of zones
+            tuple: (optimal number of zones, fitted KMeans model, labels)
         """
-        silhouette_scores = []
-        zone_range = range(self.min_zones, self.max_zones + 1)
+        inertias = {}
+        models = {}
+        labels_cache = {}
+        # A single zone has no left-hand neighbor (nor anything to delineate)
+        zone_range = range(max(self.min_zones, 2), self.max_zones + 1)
         
-        for n in zone_range:
+        for n in range(zone_range.start - 1, self.max_zones + 2):
+            if n == 1:
+                # Inertia for one cluster is the total sum of squares (no fit needed)
+                inertias[n] = float(((X - X.mean(axis=0)) ** 2).sum())
+                continue
             kmeans = KMeans(n_clusters=n, random_state=42, n_init=10)
             labels = kmeans.fit_predict(X)
-            score = silhouette_score(X, labels)
-            silhouette_scores.append(score)
+            # Inertia comes with the fit: O(n·k), unlike the O(n²) silhouette
+            inertias[n] = kmeans.inertia_
+            models[n] = kmeans
+            labels_cache[n] = labels
         
-        # Select number with highest silhouette score
-        optimal_idx = np.argmax(silhouette_scores)
-        optimal_n = list(zone_range)[optimal_idx]
+        # Select number at the sharpest bend of the inertia curve
+        # (a zero drop after k, e.g. k exact clusters, makes the ratio huge)
+        drop_ratios = [
+            (inertias[n - 1] - inertias[n]) / max(inertias[n] - inertias[n + 1], 1e-12)
+            for n in zone_range
+        ]
+        optimal_n = zone_range[int(np.argmax(drop_ratios))]
         
-        print(f"   📊 Silhouette scores:")
-        for n, score in zip(zone_range, silhouette_scores):
+        print(f"   📊 KMeans inertia:")
+        for n in zone_range:
             marker = "➜" if n == optimal_n else " "
-            print(f"   {marker} {n} zones: {score:.3f}")
+            print(f"   {marker} {n} zones: {inertias[n]:.1f}")
         
-        return optimal_n
+        return optimal_n, models[optimal_n], labels_cache[optimal_n]
     
     def fit_predict(self, yield_values: np.ndarray, 
                    features: Optional[np.ndarray] = None) -> np.ndarray:
@@ -173,46 +344,92 @@ class ZoneDelineator:
         Returns:
             Zone labels, shape (n,)
         """
-        # Prepare features
-        if features is None:
-            X = yield_values.reshape(-1, 1)
-        else:
-            X = np.c_[yield_values, features]
-        
-        # Standardize
-        X_scaled = self.scaler.fit_transform(X)
+        # Standardize (yield-only input skips StandardScaler's validation)
+        self.scaler = _YieldScaler() if features is None else StandardScaler()
+        X_scaled = self.scaler.fit_transform(self._prepare_features(yield_values, features))
         
         # Determine number of zones
         if self.n_zones is None:
             print(f"🔍 Finding optimal number of zones...")
-            self.optimal_n_zones = self._find_optimal_zones(X_scaled)
+            # The sweep fits the same model the final step would, so the
+            # winning model and labels are reused as-is
+            self.optimal_n_zones, self.model, labels = self._find_optimal_zones(X_scaled)
             n_zones = self.optimal_n_zones
             print(f"   ✅ Selected {n_zones} zones")
         else:
             n_zones = self.n_zones
             self.optimal_n_zones = n_zones
+            
+            # Fit K-Means
+            print(f"🎯 Clustering into {n_zones} management zones...")
+            self.model = KMeans(n_clusters=n_zones, random_state=42, n_init=10)
+            labels = self.model.fit_predict(X_scaled)
         
-        # Fit K-Means
-        print(f"🎯 Clustering into {n_zones} management zones...")
-        self.model = KMeans(n_clusters=n_zones, random_state=42, n_init=10)
-        labels = self.model.fit_predict(X_scaled)
-        
-        # Sort zones by mean yield (low to high)
-        zone_means = [yield_values[labels == i].mean() for i in range(n_zones)]
+        # Sort zones by mean yield (low to high); per-zone sums and counts
+        # in one pass each
+        zone_sums = np.bincount(labels, weights=yield_values, minlength=n_zones)
+        zone_means = zone_sums / np.bincount(labels, minlength=n_zones)
         zone_order = np.argsort(zone_means)
         
-        # Remap labels
-        label_map = {old: new for new, old in enumerate(zone_order)}
-        labels = np.array([label_map[label] for label in labels])
+        # Remap labels (kept so predict() uses the same zone order)
+        self.label_map = np.empty(n_zones, dtype=np.intp)
+        self.label_map[zone_order] = np.arange(n_zones)
         
-        return labels
+        return self.label_map[labels]
+    
+    def predict(self, yield_values: np.ndarray,
+                features: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Assign zones to new samples using the fitted scaler and model
+        
+        Args:
+            yield_values: Yield values, shape (n,)
+            features: Optional additional features, shape (n, m)
+            
+        Returns:
+            Zone labels, shape (n,), in the same order as fit_predict
+        """
+        if self.model is None:
+            raise ValueError("Delineator not fitted. Call fit_predict() first.")
+        
+        X_scaled = self.scaler.transform(self._prepare_features(yield_values, features))
+        return self.label_map[self.model.predict(X_scaled)]
+    
+    @staticmethod
+    def _prepare_features(yield_values: np.ndarray,
+                          features: Optional[np.ndarray] = None) -> np.ndarray:
+        """Build the feature matrix from yield and optional extra features"""
+        # Fixed float32 (halves KMeans memory traffic), so a model fitted on
+        # point yields can predict on any grid dtype
+        yield_values = np.asarray(yield_values, dtype=np.float32)
+        if features is None:
+            return yield_values.reshape(-1, 1)
+        return np.c_[yield_values, features]
+
+
+def _convex_hull(points: np.ndarray):
+    """
+    Convex hull of an (n, 2) coordinate array
+    
+    Uses Qhull directly on the coordinates; fewer than 3 points or
+    collinear/coincident points fall back to shapely (Point or LineString).
+    """
+    if len(points) >= 3:
+        try:
+            hull = ConvexHull(points)
+            return Polygon(points[hull.vertices])
+        except QhullError:
+            pass
+    return MultiPoint(points).convex_hull
 
 
 def delineate_management_zones(harvest_gdf: gpd.GeoDataFrame,
                                n_zones: Optional[int] = None,
                                resolution: float = 10.0,
                                idw_power: float = 2.0,
-                               return_grid: bool = True) -> dict:
+                               return_grid: bool = True,
+                               backend: str = 'cpu',
+                               neighbor_search: str = 'kdtree') -> dict:
     """
     Complete management zone delineation workflow
     
@@ -222,6 +439,8 @@ def delineate_management_zones(harvest_gdf: gpd.GeoDataFrame,
         resolution: Interpolation grid resolution in meters
         idw_power: IDW power parameter
         return_grid: Include interpolated grid in results
+        backend: IDW compute backend, 'cpu' or 'gpu' (requires cupy)
+        neighbor_search: IDW neighbor search, 'kdtree' or 'faiss' (requires faiss)
         
     Returns:
         dict with zones_gdf, grid_data, statistics
@@ -232,17 +451,20 @@ def delineate_management_zones(harvest_gdf: gpd.GeoDataFrame,
     # Reproject to projected CRS for accurate distances
     if harvest_gdf.crs.is_geographic:
         print(f"📐 Reprojecting to UTM...")
-        # Estimate UTM zone from centroid
-        centroid = harvest_gdf.dissolve().centroid.iloc[0]
-        utm_zone = int((centroid.x + 180) / 6) + 1
-        hemisphere = 'north' if centroid.y >= 0 else 'south'
+        # Estimate UTM zone from the mean point position (only a rough
+        # lon/lat is needed, so no dissolve/centroid)
+        mean_x = harvest_gdf.geometry.x.mean()
+        mean_y = harvest_gdf.geometry.y.mean()
+        utm_zone = int((mean_x + 180) / 6) + 1
+        hemisphere = 'north' if mean_y >= 0 else 'south'
         utm_crs = f"+proj=utm +zone={utm_zone} +{hemisphere} +datum=WGS84 +units=m +no_defs"
         harvest_utm = harvest_gdf.to_crs(utm_crs)
     else:
         harvest_utm = harvest_gdf.copy()
     
-    # Extract coordinates and values
-    coords = np.array([[geom.x, geom.y] for geom in harvest_utm.geometry])
+    # Extract coordinates (vectorized) and values
+    coords = np.column_stack([harvest_utm.geometry.x.to_numpy(),
+                              harvest_utm.geometry.y.to_numpy()])
     values = harvest_utm['yield'].values
     
     print(f"📊 Input: {len(harvest_utm)} points")
@@ -250,7 +472,8 @@ def delineate_management_zones(harvest_gdf: gpd.GeoDataFrame,
     
     # IDW interpolation
     print(f"\n🗺️  IDW Interpolation (power={idw_power}, resolution={resolution}m)...")
-    interpolator = IDWInterpolator(power=idw_power, max_neighbors=12)
+    interpolator = IDWInterpolator(power=idw_power, max_neighbors=12, backend=backend,
+                                   neighbor_search=neighbor_search)
     interpolator.fit(coords, values)
     
     bounds = harvest_utm.total_bounds
@@ -262,50 +485,63 @@ def delineate_management_zones(harvest_gdf: gpd.GeoDataFrame,
     print(f"\n🎨 Zone Delineation...")
     delineator = ZoneDelineator(n_zones=n_zones)
     
-    # Cluster on grid values
-    grid_values_flat = grid_z.ravel()
-    zone_labels = delineator.fit_predict(grid_values_flat)
+    # Cluster on the harvest points, then assign grid cells with the fitted
+    # model (the zones depend on the yield distribution, not the grid size)
+    point_labels = delineator.fit_predict(values)
+    
+    # Only cells inside the convex hull of the points are assigned a zone;
+    # cells outside the field get -1
+    grid_coords = np.c_[grid_x.ravel(), grid_y.ravel()]
+    try:
+        inside = Delaunay(coords).find_simplex(grid_coords) >= 0
+    except QhullError:
+        # Too few or collinear points: no hull to mask with
+        inside = np.ones(len(grid_coords), dtype=bool)
+    zone_labels = np.full(len(grid_coords), -1, dtype=np.intp)
+    # Thin (e.g. strip-shaped) fields can have no cell centre inside the hull
+    if inside.any():
+        zone_labels[inside] = delineator.predict(grid_z.ravel()[inside])
     zone_grid = zone_labels.reshape(grid_z.shape)
     
+    # Assign points to the zone of their nearest grid cell (one tree build
+    # and query for all zones); points whose nearest cell center falls
+    # just outside the hull keep their own predicted zone
+    grid_tree = cKDTree(grid_coords, leafsize=32, balanced_tree=False, compact_nodes=False)
+    _, nearest_grid = grid_tree.query(coords, k=1, workers=-1)
+    point_zones = zone_labels[nearest_grid]
+    outside = point_zones < 0
+    point_zones[outside] = point_labels[outside]
+    
+    # Zone statistics from the original points: counts, sums and squared
+    # deviations per zone in one bincount pass each (float64 accumulation,
+    # sample std with ddof=1 as pandas)
+    n_zones_found = delineator.optimal_n_zones
+    values64 = values.astype(np.float64)
+    zone_counts = np.bincount(point_zones, minlength=n_zones_found)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        zone_means = np.bincount(point_zones, weights=values64,
+                                 minlength=n_zones_found) / zone_counts
+        deviations = values64 - zone_means[point_zones]
+        zone_stds = np.sqrt(np.bincount(point_zones, weights=deviations * deviations,
+                                        minlength=n_zones_found) / (zone_counts - 1))
+    zone_areas = zone_counts * resolution * resolution / 10000  # hectares
+    
     # Create zone polygons (simplified)
     print(f"\n🔷 Creating zone polygons...")
     zones_list = []
     
-    for zone_id in range(delineator.optimal_n_zones):
-        mask = zone_grid == zone_id
-        zone_points = harvest_utm[values >= values.min()]  # Placeholder for actual spatial join
-        
-        # Calculate zone statistics from original points
-        points_in_zone = harvest_utm[
-            (coords[:, 0] >= bounds[0]) & 
-            (coords[:, 0] <= bounds[2]) &
-            (coords[:, 1] >= bounds[1]) & 
-            (coords[:, 1] <= bounds[3])
-        ]
-        
-        # Assign points to nearest zone
-        grid_coords = np.c_[grid_x.ravel(), grid_y.ravel()]
-        tree = cKDTree(grid_coords)
-        _, nearest_grid = tree.query(coords, k=1)
-        point_zones = zone_labels[nearest_grid]
-        
-        zone_points = harvest_utm[point_zones == zone_id]
-        
-        if len(zone_points) == 0:
+    for zone_id in range(n_zones_found):
+        if zone_counts[zone_id] == 0:
             continue
         
-        zone_yield_mean = zone_points['yield'].mean()
-        zone_yield_std = zone_points['yield'].std()
-        zone_area = len(zone_points) * resolution * resolution / 10000  # hectares
-        
         zones_list.append({
             'zone_id': zone_id,
             'zone_name': f"Zone {zone_id + 1}",
-            'n_points': len(zone_points),
-            'yield_mean': zone_yield_mean,
-            'yield_std': zone_yield_std,
-            'area_ha': zone_area,
-            'geometry': zone_points.dissolve().convex_hull.iloc[0]
+            'n_points': int(zone_counts[zone_id]),
+            'yield_mean': float(zone_means[zone_id]),
+            'yield_std': float(zone_stds[zone_id]),
+            'area_ha': float(zone_areas[zone_id]),
+            'geometry': _convex_hull(coords[point_zones == zone_id])
         })
     
     zones_gdf = gpd.GeoDataFrame(zones_list, crs=harvest_utm.crs)
@@ -316,12 +552,13 @@ def delineate_management_zones(harvest_gdf: gpd.GeoDataFrame,
     
     # Print statistics
     print(f"\n📈 Zone Statistics:")
-    print(f"{'Zone':<8} {'Points':<8} {'Yield (ton/ha)':<20} {'Area (ha)':<10}")
-    print("-" * 50)
-    for _, row in zones_gdf.iterrows():
-        print(f"Zone {row['zone_id']+1:<3} {row['n_points']:<8} "
-              f"{row['yield_mean']:>6.1f} ± {row['yield_std']:>4.1f}      "
-              f"{row['area_ha']:>6.1f}")
+    stats_table = zones_gdf[['zone_id', 'n_points', 'yield_mean', 'yield_std', 'area_ha']]
+    stats_table = stats_table.rename(columns={
+        'zone_id': 'Zone', 'n_points': 'Points', 'yield_mean': 'Yield (ton/ha)',
+        'yield_std': '± Std', 'area_ha': 'Area (ha)'
+    })
+    stats_table['Zone'] += 1
+    print(stats_table.to_string(index=False, float_format=lambda v: f"{v:.1f}"))
     
     # Prepare results
     results = {
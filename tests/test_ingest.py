@@ -44,7 +44,46 @@ class TestDataValidator:
         assert len(results['errors']) == 0
         assert results['stats']['n_points'] == 200
         assert 50 <= results['stats']['yield_mean'] <= 100
+        assert results['stats']['yield_q1'] <= results['stats']['yield_median'] <= results['stats']['yield_q3']
     
+    def test_validate_stats_with_missing_values(self):
+        """Test yield statistics ignore NaN values and match pandas"""
+        points = [Point(-47.5 + i * 1e-4, -15.5) for i in range(150)]
+        yields = np.random.uniform(50, 300, 150)
+        yields[::10] = np.nan
+
+        gdf = gpd.GeoDataFrame({
+            'yield': yields,
+            'geometry': points
+        }, crs='EPSG:4326')
+
+        validator = DataValidator(min_points=100, yield_range=(100, 250))
+        stats = validator.validate(gdf)['stats']
+        series = pd.Series(yields)
+        valid = series.dropna()
+
+        assert stats['n_missing'] == 15
+        assert stats['yield_mean'] == pytest.approx(series.mean())
+        assert stats['yield_std'] == pytest.approx(series.std())
+        assert stats['yield_min'] == series.min()
+        assert stats['yield_max'] == series.max()
+        assert stats.get('outliers_low', 0) == (valid < 100).sum()
+        assert stats.get('outliers_high', 0) == (valid > 250).sum()
+
+    def test_yield_stats_numba_matches_numpy(self):
+        """Test the Numba yield-stats kernel agrees with the NumPy path"""
+        pytest.importorskip('numba')
+        from src.ingest import _yield_stats_numba, _yield_stats_numpy
+
+        yields = np.random.uniform(0, 300, 5000).astype(np.float32)
+        yields[::7] = np.nan
+
+        numba_stats = _yield_stats_numba(yields, 50, 250)
+        numpy_stats = _yield_stats_numpy(yields, 50, 250)
+
+        assert numba_stats[:3] == numpy_stats[:3]
+        np.testing.assert_allclose(numba_stats[3:], numpy_stats[3:], rtol=1e-5)
+
     def test_validate_insufficient_points(self):
         """Test validation with too few points"""
         points = [Point(0, 0), Point(1, 1)]
@@ -153,6 +192,65 @@ class TestHarvestDataReader:
         with pytest.raises(ValueError, match="Missing columns"):
             HarvestDataReader.read_csv(csv_file)
 
+    
+    def test_read_parquet_basic(self, tmp_path):
+        """Test reading basic Parquet file"""
+        parquet_file = tmp_path / "harvest.parquet"
+        df = pd.DataFrame({
+            'latitude': [-20.0, -20.1, -20.2],
+            'longitude': [-50.0, -50.1, -50.2],
+            'yield': [80.5, 85.3, 78.9],
+            'speed': [5.0, 5.1, 4.9]
+        })
+        df.to_parquet(parquet_file, index=False)
+        
+        gdf = HarvestDataReader.read_parquet(parquet_file)
+        
+        assert len(gdf) == 3
+        assert list(gdf.columns) == ['geometry', 'yield']
+        assert gdf.crs.to_string() == 'EPSG:4326'
+        assert gdf.geometry.iloc[0].x == -50.0
+        assert gdf.geometry.iloc[0].y == -20.0
+    
+    def test_read_parquet_missing_columns(self, tmp_path):
+        """Test error on missing required Parquet columns"""
+        parquet_file = tmp_path / "incomplete.parquet"
+        df = pd.DataFrame({
+            'latitude': [-20.0],
+            'yield': [80.5]
+        })
+        df.to_parquet(parquet_file, index=False)
+        
+        with pytest.raises(ValueError, match="Missing columns"):
+            HarvestDataReader.read_parquet(parquet_file)
+
+    
+    def test_read_shapefile_basic(self, tmp_path):
+        """Test reading point shapefile"""
+        shp_file = tmp_path / "harvest.shp"
+        gpd.GeoDataFrame({
+            'yield': [80.5, 85.3],
+            'speed': [5.0, 5.1],
+            'geometry': [Point(-50.0, -20.0), Point(-50.1, -20.1)]
+        }, crs='EPSG:4326').to_file(shp_file)
+        
+        gdf = HarvestDataReader.read_shapefile(shp_file)
+        
+        assert len(gdf) == 2
+        assert list(gdf.columns) == ['geometry', 'yield']
+        assert all(gdf.geometry.geom_type == 'Point')
+    
+    def test_read_shapefile_rejects_polygons(self, tmp_path):
+        """Test error on non-point shapefile"""
+        shp_file = tmp_path / "zones.shp"
+        gpd.GeoDataFrame({
+            'yield': [80.5],
+            'geometry': [Polygon([(0, 0), (1, 0), (1, 1)])]
+        }, crs='EPSG:4326').to_file(shp_file)
+        
+        with pytest.raises(ValueError, match="point geometry"):
+            HarvestDataReader.read_shapefile(shp_file)
+
 
 class TestIngestHarvestData:
     """Test main ingestion function"""
@@ -182,6 +280,62 @@ class TestIngestHarvestData:
         assert validation['valid'] == True
         assert harvest_gdf.crs.to_string() == 'EPSG:4326'
     
+    def test_ingest_dataframe(self):
+        """Test ingestion from an in-memory DataFrame"""
+        n_points = 150
+        df = pd.DataFrame({
+            'latitude': np.random.uniform(-20, -19, n_points),
+            'longitude': np.random.uniform(-50, -49, n_points),
+            'yield': np.random.uniform(60, 100, n_points)
+        })
+        
+        harvest_gdf, boundary_gdf, validation = ingest_harvest_data(
+            dataframe=df,
+            validate=True,
+            clean_outliers=False
+        )
+        
+        assert len(harvest_gdf) == n_points
+        assert boundary_gdf is None
+        assert validation['valid'] == True
+        assert harvest_gdf.crs.to_string() == 'EPSG:4326'
+    
+    def test_ingest_requires_single_source(self, tmp_path):
+        """Test error when both or neither data sources are given"""
+        df = pd.DataFrame({'latitude': [-20.0], 'longitude': [-50.0], 'yield': [80.0]})
+        
+        with pytest.raises(ValueError, match="exactly one"):
+            ingest_harvest_data()
+        with pytest.raises(ValueError, match="exactly one"):
+            ingest_harvest_data(tmp_path / "data.csv", dataframe=df)
+    
+    def test_ingest_with_boundary(self, tmp_path):
+        """Test clipping points to field boundary"""
+        csv_file = tmp_path / "harvest.csv"
+        df = pd.DataFrame({
+            'latitude': [-20.5, -20.4, -20.9],
+            'longitude': [-49.5, -49.4, -49.9],
+            'yield': [80.0, 85.0, 90.0]
+        })
+        df.to_csv(csv_file, index=False)
+        
+        boundary_file = tmp_path / "boundary.shp"
+        gpd.GeoDataFrame(
+            geometry=[Polygon([(-49.6, -20.6), (-49.3, -20.6), (-49.3, -20.3), (-49.6, -20.3)])],
+            crs='EPSG:4326'
+        ).to_file(boundary_file)
+        
+        harvest_gdf, boundary_gdf, _ = ingest_harvest_data(
+            csv_file,
+            boundary_file=boundary_file,
+            validate=False,
+            clean_outliers=False
+        )
+        
+        assert len(boundary_gdf) == 1
+        assert list(harvest_gdf.columns) == ['geometry', 'yield']
+        assert sorted(harvest_gdf['yield']) == [80.0, 85.0]
+    
     def test_ingest_auto_detect_csv(self, tmp_path):
         """Test auto-detection of file type"""
         csv_file = tmp_path / "data.csv"
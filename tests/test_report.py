@@ -0,0 +1,102 @@
+"""
+Unit tests for report generation module
+"""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+from datetime import datetime
+from pathlib import Path
+import itertools
+import uuid
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import branca.element
+import folium
+
+from src.report import MapGenerator, ReportGenerator, generate_report
+from src.zones import delineate_management_zones
+
+
+@pytest.fixture
+def harvest_gdf():
+    """Small synthetic harvest dataset (WGS84)"""
+    rng = np.random.default_rng(0)
+    lon = rng.uniform(-47.51, -47.50, 300)
+    lat = rng.uniform(-15.51, -15.50, 300)
+    return gpd.GeoDataFrame(
+        {'yield': 80 + (lon + 47.51) * 4000 + rng.normal(0, 3, 300)},
+        geometry=gpd.points_from_xy(lon, lat),
+        crs='EPSG:4326'
+    )
+
+
+@pytest.fixture
+def deterministic_report(monkeypatch):
+    """Fixed report date and folium element ids (call to restart the ids)"""
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2024, 1, 1, 12, 0, 0)
+
+    counter = [itertools.count()]
+
+    def reset():
+        counter[0] = itertools.count()
+
+    monkeypatch.setattr('src.report.datetime', FixedDatetime)
+    monkeypatch.setattr(branca.element.Element, '_generate_id',
+                        classmethod(lambda cls: f"{next(counter[0]):032x}"))
+    monkeypatch.setattr(folium.utilities.uuid, 'uuid4',
+                        lambda: uuid.UUID(int=next(counter[0])))
+    return reset
+
+
+class TestMapGenerator:
+    """Test MapGenerator class"""
+
+    def test_create_harvest_map_empty_zones(self, harvest_gdf):
+        """Test the map renders with an empty zones layer"""
+        zones_gdf = gpd.GeoDataFrame(
+            {'zone_id': [], 'zone_name': [], 'n_points': [], 'yield_mean': [],
+             'yield_std': [], 'area_ha': []},
+            geometry=[], crs='EPSG:4326'
+        )
+
+        map_obj = MapGenerator.create_harvest_map(harvest_gdf, zones_gdf)
+
+        assert 'Management Zones' not in map_obj._repr_html_()
+
+
+class TestReportGenerator:
+    """Test ReportGenerator class"""
+
+    def test_generate_returns_rendered_html(self, harvest_gdf):
+        """Test the returned HTML has every template placeholder substituted"""
+        html = ReportGenerator().generate(harvest_gdf, field_name='Test Field')
+
+        assert isinstance(html, str)
+        assert '${' not in html
+        assert 'Test Field' in html
+
+    def test_generate_file_matches_string(self, harvest_gdf, deterministic_report, tmp_path):
+        """Test the streamed report file is byte-identical to the returned HTML"""
+        zones_gdf = delineate_management_zones(harvest_gdf, n_zones=3)['zones_gdf']
+        output_file = tmp_path / 'reports' / 'report.html'
+
+        html = generate_report(harvest_gdf, zones_gdf, 'Test Field')
+        # Restart the element ids so the second render gets the same ones
+        deterministic_report()
+        result = generate_report(harvest_gdf, zones_gdf, 'Test Field',
+                                 output_file=str(output_file))
+
+        assert result is None
+        assert output_file.read_bytes() == html.encode('utf-8')
+
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,142 @@
+"""
+Unit tests for management zone module
+"""
+
+import pytest
+import numpy as np
+import geopandas as gpd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.zones import IDWInterpolator, ZoneDelineator, delineate_management_zones
+
+
+class TestIDWInterpolator:
+    """Test IDWInterpolator class"""
+
+    @pytest.mark.parametrize('power', [2.0, 3.0, 4.0])
+    def test_numba_matches_numpy(self, power):
+        """Test the Numba IDW kernel agrees with the NumPy path"""
+        pytest.importorskip('numba')
+        rng = np.random.default_rng(3)
+        interpolator = IDWInterpolator(power=power)
+        interpolator.fit(rng.uniform(0, 300, (2000, 2)), rng.uniform(50, 150, 2000))
+        grid_points = rng.uniform(0, 300, (500, 2))
+
+        np.testing.assert_allclose(interpolator._predict(grid_points, use_numba=True),
+                                   interpolator._predict(grid_points, use_numba=False),
+                                   rtol=1e-5)
+
+    @pytest.mark.parametrize('neighbor_search', ['kdtree', 'faiss'])
+    def test_predict_single_point(self, neighbor_search):
+        """Test predict accepts a single 1-D (x, y) point"""
+        if neighbor_search == 'faiss':
+            pytest.importorskip('faiss')
+        rng = np.random.default_rng(6)
+        points = rng.uniform(0, 100, (50, 2))
+        values = rng.uniform(50, 150, 50)
+        interpolator = IDWInterpolator(neighbor_search=neighbor_search)
+        interpolator.fit(points, values)
+
+        # An exact match returns the sample value
+        np.testing.assert_allclose(interpolator.predict(points[0]), [values[0]], rtol=1e-5)
+
+
+class TestZoneDelineator:
+    """Test ZoneDelineator class"""
+
+    def test_fit_predict_orders_zones_by_yield(self):
+        """Test zone labels are ordered from low to high mean yield"""
+        rng = np.random.default_rng(0)
+        yields = np.concatenate([
+            rng.normal(60, 2, 100),
+            rng.normal(120, 2, 100),
+            rng.normal(90, 2, 100)
+        ])
+
+        delineator = ZoneDelineator(n_zones=3)
+        labels = delineator.fit_predict(yields)
+
+        zone_means = [yields[labels == i].mean() for i in range(3)]
+        assert zone_means == sorted(zone_means)
+
+    def test_predict_matches_fit_predict(self):
+        """Test predict assigns the same zones as fit_predict"""
+        rng = np.random.default_rng(1)
+        yields = rng.uniform(50, 150, 300).astype(np.float32)
+
+        delineator = ZoneDelineator(n_zones=4)
+        labels = delineator.fit_predict(yields)
+
+        np.testing.assert_array_equal(delineator.predict(yields), labels)
+        # New (float64) samples use the same low-to-high zone order
+        grid_labels = delineator.predict(np.array([40.0, 100.0, 160.0]))
+        assert grid_labels[0] == 0
+        assert grid_labels[2] == 3
+
+    @pytest.mark.parametrize('n_clusters', [3, 4])
+    def test_auto_selects_separated_clusters(self, n_clusters):
+        """Test auto-selection finds the number of well-separated clusters"""
+        rng = np.random.default_rng(4)
+        yields = np.concatenate([
+            rng.normal(60 + 25 * i, 2, 150) for i in range(n_clusters)
+        ])
+
+        delineator = ZoneDelineator(min_zones=2, max_zones=7)
+        delineator.fit_predict(yields)
+
+        assert delineator.optimal_n_zones == n_clusters
+
+    def test_predict_requires_fit(self):
+        """Test predict before fitting raises"""
+        with pytest.raises(ValueError, match="not fitted"):
+            ZoneDelineator(n_zones=2).predict(np.array([1.0, 2.0]))
+
+
+class TestDelineateManagementZones:
+    """Test delineate_management_zones workflow"""
+
+    def test_cells_outside_field_unassigned(self):
+        """Test grid cells outside the point hull get label -1"""
+        rng = np.random.default_rng(2)
+        # Triangular field: half of the bounding box lies outside it
+        x = rng.uniform(0, 500, 2000)
+        y = rng.uniform(0, 500, 2000)
+        keep = y <= x
+        harvest_gdf = gpd.GeoDataFrame(
+            {'yield': 50 + x[keep] / 10 + rng.normal(0, 2, keep.sum())},
+            geometry=gpd.points_from_xy(x[keep], y[keep]),
+            crs='EPSG:32723'
+        )
+
+        results = delineate_management_zones(harvest_gdf, n_zones=3, resolution=20.0)
+        zone_grid = results['grid']['zone_labels']
+
+        assert (zone_grid == -1).any()
+        assert set(np.unique(zone_grid[zone_grid >= 0])) == {0, 1, 2}
+        assert results['zones_gdf']['n_points'].sum() == len(harvest_gdf)
+
+    def test_no_cells_inside_field(self):
+        """Test a thin strip with no grid cell centre inside its hull"""
+        rng = np.random.default_rng(5)
+        # Anti-diagonal strip x + y ≈ 100, coarser than the grid resolution
+        t = rng.uniform(0, 100, 400)
+        harvest_gdf = gpd.GeoDataFrame(
+            {'yield': 50 + t / 2 + rng.normal(0, 2, 400)},
+            geometry=gpd.points_from_xy(t + rng.normal(0, 0.5, 400),
+                                        100 - t + rng.normal(0, 0.5, 400)),
+            crs='EPSG:32723'
+        )
+
+        results = delineate_management_zones(harvest_gdf, resolution=40.0)
+
+        assert (results['grid']['zone_labels'] == -1).all()
+        assert results['zones_gdf']['n_points'].sum() == len(harvest_gdf)
+
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, '-v'])